@@ -0,0 +1,549 @@
+#!/usr/bin/env python3
+"""
+Event Store
+
+Bounded in-memory store for normalized GitHub webhook events with append-only
+JSON Lines persistence. The webhook processor records each processed event
+here; the MCP server exposes the stored events to agents via query tools.
+
+Persistence is append-only: each add writes a single JSON line instead of
+rewriting the whole file, so the per-event write cost stays constant no matter
+how many events are retained. A periodic compaction rewrites the file from the
+in-memory deque to bound file growth.
+
+Copyright (C) 2025 SanctumOS
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import asyncio
+import atexit
+import json
+import logging
+import os
+import queue
+import threading
+import time
+from collections import defaultdict, deque
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from itertools import islice
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+# orjson serializes/parses several times faster than stdlib json; fall back
+# to stdlib if it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+# sortedcontainers backs the timestamp index; without it, 'since' queries
+# fall back to a linear scan.
+try:
+    from sortedcontainers import SortedList, SortedSet
+except ImportError:
+    SortedList = None
+    SortedSet = None
+
+logger = logging.getLogger(__name__)
+
+# Default persistence location (override with EVENT_STORE_FILE)
+DEFAULT_PERSIST_FILE = os.getenv('EVENT_STORE_FILE', 'events.jsonl')
+
+# Default maximum number of events kept in memory and on disk
+DEFAULT_MAX_SIZE = 1000
+
+# Write batching: the flusher thread combines up to this many queued events
+# into a single write, waiting at most this long for more to arrive.
+FLUSH_BATCH_SIZE = 64
+FLUSH_WINDOW_SECONDS = 0.05
+
+# Queue sentinel used to stop the flusher thread
+_SHUTDOWN = object()
+
+# Guards flusher restarts in forked children. Deliberately module-level: the
+# store's own locks are inherited from the parent and may have been held at
+# fork time, so they cannot protect their own replacement.
+_FORK_LOCK = threading.Lock()
+
+
+def _dump_line(event: Dict[str, Any]) -> str:
+    """Serialize one event to a compact JSON line"""
+    if orjson is not None:
+        return orjson.dumps(event, default=str).decode() + '\n'
+    return json.dumps(event, separators=(',', ':'), default=str) + '\n'
+
+
+def _load_line(line) -> Dict[str, Any]:
+    """Parse one persisted JSON line"""
+    if orjson is not None:
+        return orjson.loads(line)
+    return json.loads(line)
+
+
+def parse_timestamp(value: Optional[str]) -> Optional[float]:
+    """Parse an ISO 8601 timestamp to a float epoch (naive values are UTC)"""
+    if not value:
+        return None
+    try:
+        dt = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt.timestamp()
+
+
+@dataclass(slots=True)
+class IndexedEvent:
+    """
+    Slotted view of a stored event
+
+    Keeps the precomputed filter fields as attributes next to the raw event
+    dict: attribute reads in the query loops are cheaper than dict lookups,
+    slots avoid a per-event __dict__, and the raw payload stays free of
+    internal bookkeeping keys when serialized.
+    """
+    raw: Dict[str, Any]
+    ts: float
+    repo_lc_full: str
+    repo_lc_name: str
+    event_type: str
+    delivery_id: str
+
+
+def _wrap_event(raw: Dict[str, Any]) -> IndexedEvent:
+    """Build the indexed view of a raw event dict"""
+    # Older persisted lines carried the precomputed fields inline; lift them
+    # out so the raw dict stays clean either way.
+    ts = raw.pop('_ts', None)
+    repo_lc_full = raw.pop('_repo_lc_full', None)
+    repo_lc_name = raw.pop('_repo_lc_name', None)
+    raw.pop('_repo_lc', None)
+
+    if ts is None:
+        ts = parse_timestamp(raw.get('timestamp')) or 0.0
+    if repo_lc_full is None:
+        repo = raw.get('repository') or {}
+        repo_lc_full = (repo.get('full_name') or '').lower()
+        repo_lc_name = (repo.get('name') or '').lower()
+
+    return IndexedEvent(
+        raw=raw,
+        ts=ts,
+        repo_lc_full=repo_lc_full or '',
+        repo_lc_name=repo_lc_name or '',
+        event_type=raw.get('event_type', 'unknown'),
+        delivery_id=raw.get('delivery_id') or '',
+    )
+
+
+class EventStore:
+    """Bounded store of recent webhook events with JSONL persistence"""
+
+    def __init__(self, persist_file: Optional[str] = None, max_size: int = DEFAULT_MAX_SIZE):
+        """
+        Initialize the event store
+
+        Args:
+            persist_file: Path to the JSONL persistence file (defaults to EVENT_STORE_FILE)
+            max_size: Maximum number of events to retain
+        """
+        self.persist_file = Path(persist_file or DEFAULT_PERSIST_FILE)
+        self.max_size = max_size
+        self.events: deque = deque(maxlen=max_size)
+
+        # Side indices for the fields the MCP tools filter on. Maintained on
+        # every add/evict so lookups never scan the whole deque.
+        self._by_id: Dict[str, IndexedEvent] = {}
+        self._by_type: defaultdict = defaultdict(deque)
+        self._by_repo: defaultdict = defaultdict(deque)
+        self._by_ts = SortedList(key=lambda e: e.ts) if SortedList else None
+
+        # Repository names kept in sorted order so get_stats never re-sorts
+        self._sorted_repos = SortedSet() if SortedSet else None
+
+        # Guards the deque and side indices: an add is a multi-step
+        # read-modify-write (evict check, append, index updates) and the
+        # webhook app runs under threaded gunicorn workers.
+        self._lock = threading.Lock()
+
+        self._load_events()
+
+        # Long-lived append handle; line-buffered so each event line is
+        # flushed without rewriting the file.
+        self._fp = open(self.persist_file, 'a', buffering=1)
+        self._fp_lock = threading.Lock()
+        self._adds_since_compact = 0
+
+        # Persistence happens off the request path: add_event only queues the
+        # event and a daemon thread batches the queued lines into one write.
+        self._closed = False
+        self._start_flusher()
+        atexit.register(self.close)
+
+    def _start_flusher(self) -> None:
+        """Start the flusher thread for the current process"""
+        self._write_q: queue.Queue = queue.Queue()
+        self._flush_thread = threading.Thread(target=self._flusher, daemon=True)
+        self._flush_thread.start()
+        # Set last: _ensure_flusher treats a matching pid as fully started
+        self._pid = os.getpid()
+
+    def _ensure_flusher(self) -> None:
+        """Restart the flusher if this process forked since it was started
+
+        Threads do not survive fork(). Under gunicorn's preload_app the
+        store is built in the master at import time, so without this every
+        worker would queue events against a dead flusher: nothing persisted,
+        the queue growing without bound, and flush() deadlocking.
+        """
+        if self._pid == os.getpid():
+            return
+
+        with _FORK_LOCK:
+            if self._pid == os.getpid():
+                return
+
+            # The inherited handle shares its file offset with the parent;
+            # abandon it (never close the parent's) and open our own. The
+            # inherited locks and queue may have been mid-operation at fork
+            # time, so they are replaced rather than reused.
+            self._fp = open(self.persist_file, 'a', buffering=1)
+            self._fp_lock = threading.Lock()
+            self._lock = threading.Lock()
+            self._closed = False
+            self._start_flusher()
+
+    def _load_events(self) -> None:
+        """Load persisted events from the JSONL file"""
+        if not self.persist_file.exists():
+            return
+
+        try:
+            # Read the whole file in one shot; the file is bounded by
+            # compaction, and a single read beats chunked reads through a
+            # file object.
+            data = self.persist_file.read_bytes()
+            # Only the newest max_size lines can survive the deque bound, so
+            # skip parsing anything older. The file can exceed max_size lines
+            # between compactions or after max_size was lowered.
+            for line in data.splitlines()[-self.max_size:]:
+                if line:
+                    self._record_event(_load_line(line))
+
+            logger.info(f"Loaded {len(self.events)} events from {self.persist_file}")
+
+        except Exception as e:
+            logger.error(f"Failed to load events from {self.persist_file}: {e}")
+
+    def _flusher(self) -> None:
+        """Drain queued events and write them in batches"""
+        while True:
+            event = self._write_q.get()
+            stop = event is _SHUTDOWN
+            batch = [] if stop else [event]
+
+            # Drain more queued events, bounded by batch size and window
+            deadline = time.monotonic() + FLUSH_WINDOW_SECONDS
+            while not stop and len(batch) < FLUSH_BATCH_SIZE:
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    item = self._write_q.get(timeout=timeout)
+                except queue.Empty:
+                    break
+                if item is _SHUTDOWN:
+                    stop = True
+                    break
+                batch.append(item)
+
+            if batch:
+                buf = ''.join(_dump_line(e) for e in batch)
+                with self._fp_lock:
+                    try:
+                        self._fp.write(buf)
+                        self._fp.flush()
+                    except Exception as e:
+                        logger.error(f"Failed to persist event batch: {e}")
+
+            for _ in range(len(batch) + (1 if stop else 0)):
+                self._write_q.task_done()
+
+            if stop:
+                break
+
+            # Compact periodically so the on-disk file stays bounded even
+            # though appends never remove evicted events.
+            if self._adds_since_compact >= self.max_size and self._write_q.empty():
+                self.compact()
+
+    @staticmethod
+    def _repo_key(event: IndexedEvent) -> str:
+        """Index key for an event's repository
+
+        Falls back to the bare name when full_name is absent so every event
+        with any repository identifier is reachable through the repo index;
+        the name is a substring of the full name, so needle matching against
+        the key is equivalent to matching either field.
+        """
+        repo = event.raw.get('repository') or {}
+        return repo.get('full_name') or repo.get('name') or ''
+
+    def _record_event(self, raw: Dict[str, Any]) -> IndexedEvent:
+        """Wrap a raw event and append it to the deque and side indices"""
+        event = _wrap_event(raw)
+
+        # The deque is about to evict its oldest event; drop it from the
+        # indices first so they stay in sync.
+        if len(self.events) == self.max_size:
+            self._unindex_event(self.events[0])
+
+        self.events.append(event)
+
+        if event.delivery_id:
+            self._by_id[event.delivery_id] = event
+        self._by_type[event.event_type].append(event)
+        repo_key = self._repo_key(event)
+        if repo_key:
+            self._by_repo[repo_key].append(event)
+            if self._sorted_repos is not None:
+                self._sorted_repos.add(repo_key)
+        if self._by_ts is not None:
+            self._by_ts.add(event)
+
+        return event
+
+    def _unindex_event(self, event: IndexedEvent) -> None:
+        """Remove an evicted event from the side indices"""
+        if event.delivery_id and self._by_id.get(event.delivery_id) is event:
+            del self._by_id[event.delivery_id]
+
+        # Events are evicted in insertion order, so the evicted event is the
+        # head of its per-type and per-repo deques.
+        for index, key in (
+            (self._by_type, event.event_type),
+            (self._by_repo, self._repo_key(event)),
+        ):
+            dq = index.get(key)
+            if dq:
+                if dq[0] is event:
+                    dq.popleft()
+                else:
+                    try:
+                        dq.remove(event)
+                    except ValueError:
+                        pass
+                if not dq:
+                    del index[key]
+
+        if self._by_ts is not None:
+            try:
+                self._by_ts.remove(event)
+            except ValueError:
+                pass
+
+        # Drop the repo from the sorted set once its last event is gone
+        repo_key = self._repo_key(event)
+        if self._sorted_repos is not None and repo_key and repo_key not in self._by_repo:
+            self._sorted_repos.discard(repo_key)
+
+    def add_event(self, event: Dict[str, Any]) -> None:
+        """
+        Add an event to the store
+
+        Args:
+            event: Normalized event data from the webhook processor
+        """
+        self._ensure_flusher()
+        with self._lock:
+            self._record_event(event)
+            self._adds_since_compact += 1
+            # Queue under the lock so compact()'s snapshot sees the deque
+            # and the queue as one consistent cut: anything queued is
+            # already in the deque, never the other way around.
+            self._write_q.put(event)
+
+    async def add_event_async(self, event: Dict[str, Any]) -> None:
+        """
+        Add an event from async code without blocking the event loop
+
+        add_event itself only touches memory (persistence happens on the
+        flusher thread), but offloading to the executor keeps async callers
+        safe even if the synchronous path ever grows blocking work.
+
+        Args:
+            event: Normalized event data from the webhook processor
+        """
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self.add_event, event)
+
+    def flush(self) -> None:
+        """Block until all queued events have been written"""
+        self._ensure_flusher()
+        self._write_q.join()
+
+    def compact(self) -> None:
+        """Rewrite the persistence file from the in-memory events"""
+        try:
+            tmp_file = self.persist_file.with_suffix('.jsonl.tmp')
+            # Snapshot under the index lock: request threads append to the
+            # deque concurrently, and iterating it unlocked raises
+            # "deque mutated during iteration" under load.
+            with self._lock:
+                lines = [_dump_line(event.raw) for event in self.events]
+
+                # Events still queued at this point are already in the
+                # snapshot (add_event queues under the same lock after
+                # recording), so appending them after the rewrite would
+                # persist them twice. Drop them here; only the shutdown
+                # sentinel is put back.
+                pending_shutdown = False
+                while True:
+                    try:
+                        item = self._write_q.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _SHUTDOWN:
+                        pending_shutdown = True
+                    self._write_q.task_done()
+                if pending_shutdown:
+                    self._write_q.put(_SHUTDOWN)
+
+            with self._fp_lock:
+                with open(tmp_file, 'w') as f:
+                    f.writelines(lines)
+
+                self._fp.close()
+                os.replace(tmp_file, self.persist_file)
+                self._fp = open(self.persist_file, 'a', buffering=1)
+                self._adds_since_compact = 0
+
+            logger.info(f"Compacted event store to {len(lines)} events")
+
+        except Exception as e:
+            logger.error(f"Failed to compact event store: {e}")
+
+    def get_events(
+        self,
+        limit: int = 50,
+        event_type: Optional[str] = None,
+        repository: Optional[str] = None,
+        since_ts: Optional[float] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Get recent events, newest first, with optional filters
+
+        Args:
+            limit: Maximum number of events to return
+            event_type: Only return events of this type (e.g. 'push', 'issues')
+            repository: Only return events whose repository name contains this string
+            since_ts: Only return events at or after this epoch timestamp
+                (callers parse ISO strings once via parse_timestamp)
+
+        Returns:
+            List of matching events, newest first
+        """
+        repo_needle = repository.lower() if repository else None
+
+        # Pick the narrowest source: an index deque visits only matching
+        # events instead of the whole store.
+        src = self.events
+        check_type = event_type is not None
+        check_repo = repo_needle is not None
+        check_since = since_ts is not None
+
+        if event_type is not None:
+            src = self._by_type.get(event_type)
+            if not src:
+                return []
+            check_type = False
+        elif repo_needle is not None:
+            matching_repos = [k for k in self._by_repo if repo_needle in k.lower()]
+            if not matching_repos:
+                return []
+            if len(matching_repos) == 1:
+                # Single matching repository: iterate its deque directly.
+                # Multiple matches fall back to the main deque to preserve
+                # newest-first ordering across repositories.
+                src = self._by_repo[matching_repos[0]]
+                check_repo = False
+
+        if check_since and src is self.events and self._by_ts is not None:
+            # Bisect the timestamp index instead of scanning: only events at
+            # or after since_ts are visited, newest first.
+            src_iter = self._by_ts.irange_key(min_key=since_ts, reverse=True)
+            check_since = False
+        else:
+            src_iter = reversed(src)
+
+        # Express the remaining filters as generator stages and let islice
+        # drive the iteration at C level rather than a per-event for/continue
+        # chain.
+        it = src_iter
+        if check_type:
+            it = (e for e in it if e.event_type == event_type)
+        if check_repo:
+            it = (
+                e for e in it
+                if repo_needle in e.repo_lc_full or repo_needle in e.repo_lc_name
+            )
+        if check_since:
+            it = (e for e in it if e.ts >= since_ts)
+
+        return [e.raw for e in islice(it, limit)]
+
+    def get_event_by_id(self, delivery_id: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a single event by its GitHub delivery ID
+
+        Args:
+            delivery_id: X-GitHub-Delivery UUID of the event
+
+        Returns:
+            The event, or None if not found
+        """
+        event = self._by_id.get(delivery_id)
+        return event.raw if event is not None else None
+
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get summary statistics over the stored events
+
+        Returns:
+            Dict with total count, per-type counts, and known repositories
+        """
+        # The side indices are maintained on every add/evict, so the stats
+        # fall out of them without walking the deque.
+        return {
+            'total_events': len(self.events),
+            'max_size': self.max_size,
+            'events_by_type': {etype: len(dq) for etype, dq in self._by_type.items()},
+            'repositories': (
+                list(self._sorted_repos)
+                if self._sorted_repos is not None
+                else sorted(self._by_repo)
+            ),
+            'persist_file': str(self.persist_file),
+        }
+
+    def close(self) -> None:
+        """Stop the flusher, then flush and close the persistence file"""
+        if self._closed:
+            return
+        self._closed = True
+
+        try:
+            self._write_q.put(_SHUTDOWN)
+            self._flush_thread.join(timeout=2.0)
+
+            with self._fp_lock:
+                self._fp.flush()
+                self._fp.close()
+        except Exception as e:
+            logger.error(f"Failed to close event store: {e}")
@@ -0,0 +1,39 @@
+"""
+Gunicorn configuration for the GitHub webhook processor.
+
+Run with:
+
+    gunicorn -c gunicorn.conf.py webhook_processor:app
+
+Copyright (C) 2025 AnimusUNO
+
+This program is free software: you can redistribute it and/or modify
+it under the terms of the GNU Affero General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+"""
+
+import os
+
+bind = f"0.0.0.0:{os.getenv('PORT', '5000')}"
+
+# Webhook handling is I/O-bound (Letta calls, event store writes), so
+# threaded workers let each process overlap requests while blocked on I/O.
+# Worker count defaults to 1: every worker appends to and compacts the same
+# events.jsonl, and a compaction rewrites the file from that worker's
+# in-memory view alone, discarding the other workers' events. Only raise
+# GUNICORN_WORKERS with per-worker EVENT_STORE_FILE paths.
+workers = int(os.getenv('GUNICORN_WORKERS', 1))
+worker_class = "gthread"
+threads = int(os.getenv('GUNICORN_THREADS', 8))
+
+timeout = 30
+keepalive = 2
+
+# Recycle workers periodically to bound any slow memory growth
+max_requests = 1000
+max_requests_jitter = 100
+
+# Import the app (structlog configuration, Letta client, event store) once
+# in the master before forking workers instead of once per worker
+preload_app = True
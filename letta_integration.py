@@ -13,20 +13,43 @@ the Free Software Foundation, either version 3 of the License, or
 (at your option) any later version.
 """
 
+import asyncio
 import os
 import logging
 from typing import Optional, Dict, Any
+
+import httpx
 from letta_client import Letta, MessageCreate
 from dotenv import load_dotenv
 
+# AsyncLetta allows truly async sends without tying up executor threads;
+# older letta_client versions only ship the sync client.
+try:
+    from letta_client import AsyncLetta
+except ImportError:
+    AsyncLetta = None
+
+# orjson renders the event payload much faster than Python's dict repr;
+# fall back to repr if it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
 class LettaClient:
-    """Client for sending messages to Letta agents"""
-    
+    """
+    Client for sending messages to Letta agents
+
+    Construct this once and reuse it: the underlying HTTP client keeps a
+    pool of keep-alive connections, so creating a LettaClient per request
+    would pay a fresh TCP/TLS handshake on every send.
+    """
+
     def __init__(self):
         """Initialize the Letta client with environment configuration"""
         self.base_url = os.getenv('LETTA_BASE_URL')
@@ -42,12 +65,27 @@ class LettaClient:
         if not self.agent_id:
             raise ValueError("LETTA_AGENT_ID environment variable is required")
         
-        # Create the client
-        self.client = Letta(
-            base_url=self.base_url,
-            token=self.token,
-            project=self.project
+        # Create the client with a pooled HTTP transport so repeated sends
+        # reuse keep-alive connections instead of re-handshaking.
+        client_kwargs = {
+            'base_url': self.base_url,
+            'token': self.token,
+            'project': self.project,
+        }
+        pooled = httpx.Client(
+            limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60),
         )
+        try:
+            self.client = Letta(httpx_client=pooled, **client_kwargs)
+        except TypeError:
+            # Older letta_client versions manage their own HTTP client;
+            # close the pooled one we built for nothing
+            pooled.close()
+            self.client = Letta(**client_kwargs)
+
+        # Async client is created lazily on first async send
+        self._client_kwargs = client_kwargs
+        self.async_client = None
         
         logger.info(f"Letta client initialized for agent {self.agent_id}")
     
@@ -81,25 +119,90 @@ class LettaClient:
                 agent_id=agent_id,
                 messages=[message]
             )
-            
-            # Extract response content
-            if response.messages:
-                last_message = response.messages[-1]
-                if hasattr(last_message, 'content'):
-                    response_content = last_message.content
-                else:
-                    response_content = str(last_message)
-                
-                logger.info(f"Received response from Letta: {response_content[:100]}...")
-                return response_content
-            else:
-                logger.warning("No response messages received from Letta")
-                return "No response received"
-                
+
+            return self._extract_response_content(response)
+
         except Exception as e:
             logger.error(f"Error sending message to Letta: {e}")
             raise
-    
+
+    def _get_async_client(self):
+        """Get or create the async Letta client (None if unsupported)"""
+        if self.async_client is None and AsyncLetta is not None:
+            pooled = httpx.AsyncClient(
+                limits=httpx.Limits(max_keepalive_connections=10, keepalive_expiry=60),
+            )
+            try:
+                self.async_client = AsyncLetta(httpx_client=pooled, **self._client_kwargs)
+            except TypeError:
+                # Older letta_client versions manage their own HTTP client;
+                # dispose of the pooled one we built for nothing. aclose()
+                # must run on the loop, so schedule it there.
+                try:
+                    asyncio.get_running_loop().create_task(pooled.aclose())
+                except RuntimeError:
+                    pass
+                self.async_client = AsyncLetta(**self._client_kwargs)
+        return self.async_client
+
+    async def send_message_async(self, content: str, agent_id: Optional[str] = None, identity_id: Optional[str] = None) -> str:
+        """
+        Send a message to a Letta agent without blocking the event loop
+
+        Uses the async Letta client when available; otherwise falls back to
+        running the synchronous send on an executor thread.
+
+        Args:
+            content: The message content to send
+            agent_id: The agent ID (defaults to configured agent)
+            identity_id: The user identity ID (defaults to configured identity)
+
+        Returns:
+            The agent's response content
+        """
+        client = self._get_async_client()
+        if client is None:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(None, self.send_message, content, agent_id, identity_id)
+
+        agent_id = agent_id or self.agent_id
+        identity_id = identity_id or self.identity_id
+
+        message = MessageCreate(
+            role="user",
+            content=content,
+            sender_id=identity_id
+        )
+
+        logger.info(f"Sending message to Letta agent {agent_id}: {content[:100]}...")
+
+        try:
+            response = await client.agents.messages.create(
+                agent_id=agent_id,
+                messages=[message]
+            )
+
+            return self._extract_response_content(response)
+
+        except Exception as e:
+            logger.error(f"Error sending message to Letta: {e}")
+            raise
+
+    def _extract_response_content(self, response) -> str:
+        """Extract the agent's reply content from a messages.create response"""
+        if response.messages:
+            last_message = response.messages[-1]
+            if hasattr(last_message, 'content'):
+                response_content = last_message.content
+            else:
+                response_content = str(last_message)
+
+            logger.info(f"Received response from Letta: {response_content[:100]}...")
+            return response_content
+        else:
+            logger.warning("No response messages received from Letta")
+            return "No response received"
+
     def send_github_event(self, event_data: Dict[str, Any]) -> str:
         """
         Send a GitHub webhook event to the Letta agent
@@ -157,8 +260,13 @@ class LettaClient:
             if commits:
                 message += f"Latest: {commits[0].get('message', 'No message')[:100]}...\n"
         
-        # Add full event data for context
-        message += f"\nFull event data: {event_data}"
-        
+        # Add full event data for context. For large payloads (pushes with
+        # many commits) orjson is roughly an order of magnitude faster than
+        # formatting the dict through repr, and produces valid JSON.
+        if orjson is not None:
+            message += f"\nFull event data: {orjson.dumps(event_data, default=str).decode()}"
+        else:
+            message += f"\nFull event data: {event_data}"
+
         return message
 
@@ -26,9 +26,19 @@ from mcp.server import Server
 from mcp.server.stdio import stdio_server
 from mcp.types import TextContent, Tool
 
+# orjson serializes several times faster than stdlib json; fall back to
+# stdlib if it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import Letta integration
 from letta_integration import LettaClient
 
+# Import event store
+from event_store import EventStore, parse_timestamp
+
 # Load environment variables
 load_dotenv()
 
@@ -46,6 +56,22 @@ logger = logging.getLogger(__name__)
 # Global Letta client instance
 letta_client: LettaClient | None = None
 
+# Global event store instance
+event_store_instance: EventStore | None = None
+
+
+# MCP traffic is machine-to-machine, so responses are compact by default;
+# set MCP_PRETTY_JSON=true when debugging by hand.
+PRETTY_JSON = os.getenv('MCP_PRETTY_JSON', 'False').lower() == 'true'
+
+
+def _to_json(obj: Any) -> str:
+    """Serialize a tool result to JSON text."""
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if PRETTY_JSON else 0
+        return orjson.dumps(obj, option=option, default=str).decode()
+    return json.dumps(obj, indent=2 if PRETTY_JSON else None, default=str)
+
 
 def get_letta_client() -> LettaClient:
     """Get or create the Letta client instance."""
@@ -59,6 +85,18 @@ def get_letta_client() -> LettaClient:
     return letta_client
 
 
+def get_event_store() -> EventStore:
+    """Get or create the event store instance."""
+    global event_store_instance
+    if event_store_instance is None:
+        try:
+            event_store_instance = EventStore()
+        except Exception as e:
+            logger.error(f"Failed to initialize event store: {e}")
+            raise
+    return event_store_instance
+
+
 def create_server() -> Server:
     """Create and configure the MCP server instance."""
     server = Server(name="code-buddy-mcp", version="0.1.0")
@@ -89,6 +127,53 @@ def create_server() -> Server:
                     },
                     "required": ["message"]
                 }
+            ),
+            Tool(
+                name="get_recent_events",
+                description="Get recent GitHub webhook events from the event store, newest first, with optional filters.",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "limit": {
+                            "type": "integer",
+                            "description": "Maximum number of events to return (default 50)"
+                        },
+                        "event_type": {
+                            "type": "string",
+                            "description": "Only return events of this type (e.g. 'push', 'issues', 'pull_request')"
+                        },
+                        "repository": {
+                            "type": "string",
+                            "description": "Only return events whose repository name contains this string"
+                        },
+                        "since": {
+                            "type": "string",
+                            "description": "Only return events at or after this ISO 8601 timestamp"
+                        }
+                    }
+                }
+            ),
+            Tool(
+                name="get_event_stats",
+                description="Get summary statistics over the stored GitHub webhook events.",
+                inputSchema={
+                    "type": "object",
+                    "properties": {}
+                }
+            ),
+            Tool(
+                name="get_event_by_id",
+                description="Look up a single stored GitHub webhook event by its X-GitHub-Delivery ID.",
+                inputSchema={
+                    "type": "object",
+                    "properties": {
+                        "delivery_id": {
+                            "type": "string",
+                            "description": "The X-GitHub-Delivery UUID of the event"
+                        }
+                    },
+                    "required": ["delivery_id"]
+                }
             )
         ]
     
@@ -99,7 +184,7 @@ def create_server() -> Server:
             if tool_name == "send_message_to_letta":
                 message = arguments.get("message")
                 if not message:
-                    return [TextContent(type="text", text=json.dumps({"error": "message is required"}))]
+                    return [TextContent(type="text", text=_to_json({"error": "message is required"}))]
                 
                 agent_id = arguments.get("agent_id")
                 identity_id = arguments.get("identity_id")
@@ -111,29 +196,94 @@ def create_server() -> Server:
                 try:
                     client = get_letta_client()
                 except Exception as e:
-                    return [TextContent(type="text", text=json.dumps({"error": f"Letta client not available: {e}"}))]
+                    return [TextContent(type="text", text=_to_json({"error": f"Letta client not available: {e}"}))]
                 
-                # Send message in thread pool (since Letta client is synchronous)
-                loop = asyncio.get_event_loop()
+                # Send via the async client; falls back to an executor thread
+                # internally if the SDK has no async support
                 try:
-                    response = await loop.run_in_executor(
-                        None,
-                        client.send_message,
+                    response = await client.send_message_async(
                         prefixed_message,
                         agent_id,
                         identity_id
                     )
-                    return [TextContent(type="text", text=json.dumps({"response": response}, indent=2))]
+                    return [TextContent(type="text", text=_to_json({"response": response}))]
                 except Exception as e:
                     logger.error(f"Error sending message to Letta: {e}")
-                    return [TextContent(type="text", text=json.dumps({"error": str(e)}))]
+                    return [TextContent(type="text", text=_to_json({"error": str(e)}))]
             
+            elif tool_name == "get_recent_events":
+                try:
+                    store = get_event_store()
+                except Exception as e:
+                    return [TextContent(type="text", text=_to_json({"error": f"Event store not available: {e}"}))]
+
+                # Validate 'since' once here so the store compares plain floats
+                since = arguments.get("since")
+                since_ts = None
+                if since:
+                    since_ts = parse_timestamp(since)
+                    if since_ts is None:
+                        return [TextContent(type="text", text=_to_json({"error": f"Invalid 'since' timestamp: {since}"}))]
+
+                loop = asyncio.get_event_loop()
+                events = await loop.run_in_executor(
+                    None,
+                    lambda: store.get_events(
+                        limit=arguments.get("limit", 50),
+                        event_type=arguments.get("event_type"),
+                        repository=arguments.get("repository"),
+                        since_ts=since_ts
+                    )
+                )
+                if orjson is not None and not PRETTY_JSON:
+                    # Serialize events one at a time into a single growing
+                    # buffer instead of materializing the whole response dict
+                    # through the encoder in one shot.
+                    buf = bytearray(b'{"count":')
+                    buf += str(len(events)).encode()
+                    buf += b',"events":['
+                    for i, event in enumerate(events):
+                        if i:
+                            buf += b','
+                        buf += orjson.dumps(event, default=str)
+                    buf += b']}'
+                    text = buf.decode()
+                else:
+                    text = _to_json({"count": len(events), "events": events})
+                return [TextContent(type="text", text=text)]
+
+            elif tool_name == "get_event_stats":
+                try:
+                    store = get_event_store()
+                except Exception as e:
+                    return [TextContent(type="text", text=_to_json({"error": f"Event store not available: {e}"}))]
+
+                loop = asyncio.get_event_loop()
+                stats = await loop.run_in_executor(None, store.get_stats)
+                return [TextContent(type="text", text=_to_json(stats))]
+
+            elif tool_name == "get_event_by_id":
+                delivery_id = arguments.get("delivery_id")
+                if not delivery_id:
+                    return [TextContent(type="text", text=_to_json({"error": "delivery_id is required"}))]
+
+                try:
+                    store = get_event_store()
+                except Exception as e:
+                    return [TextContent(type="text", text=_to_json({"error": f"Event store not available: {e}"}))]
+
+                loop = asyncio.get_event_loop()
+                event = await loop.run_in_executor(None, store.get_event_by_id, delivery_id)
+                if event is None:
+                    return [TextContent(type="text", text=_to_json({"error": f"No event found with delivery_id: {delivery_id}"}))]
+                return [TextContent(type="text", text=_to_json(event))]
+
             else:
-                return [TextContent(type="text", text=json.dumps({"error": f"Unknown tool: {tool_name}"}))]
+                return [TextContent(type="text", text=_to_json({"error": f"Unknown tool: {tool_name}"}))]
         
         except Exception as e:
             logger.error(f"Error executing tool {tool_name}: {e}")
-            return [TextContent(type="text", text=json.dumps({"error": str(e)}))]
+            return [TextContent(type="text", text=_to_json({"error": str(e)}))]
     
     return server
 
@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+"""
+Event Store - Test Suite
+
+Tests for the bounded event store including persistence, filtering,
+lookup, statistics, and compaction.
+"""
+
+import asyncio
+import json
+import sys
+import threading
+
+import pytest
+
+import event_store
+from event_store import EventStore, parse_timestamp
+
+
+def make_event(delivery_id: str, event_type: str = 'issues',
+               repo_full_name: str = 'test-org/sample-repo',
+               timestamp: str = '2025-01-01T00:00:00+00:00') -> dict:
+    """Build a minimal normalized event"""
+    name = repo_full_name.split('/')[-1]
+    return {
+        'event_type': event_type,
+        'delivery_id': delivery_id,
+        'timestamp': timestamp,
+        'action': 'opened',
+        'repository': {
+            'name': name,
+            'full_name': repo_full_name
+        }
+    }
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Event store backed by a temporary file"""
+    return EventStore(persist_file=str(tmp_path / 'events.jsonl'), max_size=10)
+
+
+class TestEventStore:
+    """Test event store functionality"""
+
+    def test_add_and_get_events(self, store):
+        """Test basic add/get roundtrip, newest first"""
+        store.add_event(make_event('id-1'))
+        store.add_event(make_event('id-2'))
+
+        events = store.get_events()
+        assert len(events) == 2
+        assert events[0]['delivery_id'] == 'id-2'
+        assert events[1]['delivery_id'] == 'id-1'
+
+    def test_max_size_eviction(self, store):
+        """Test that the store evicts oldest events beyond max_size"""
+        for i in range(15):
+            store.add_event(make_event(f'id-{i}'))
+
+        events = store.get_events(limit=100)
+        assert len(events) == 10
+        assert events[0]['delivery_id'] == 'id-14'
+        assert events[-1]['delivery_id'] == 'id-5'
+
+        # Evicted events are no longer addressable
+        assert store.get_event_by_id('id-0') is None
+        assert store.get_event_by_id('id-5') is not None
+
+    def test_persistence_roundtrip(self, tmp_path):
+        """Test that events survive a store reload"""
+        path = str(tmp_path / 'events.jsonl')
+        store = EventStore(persist_file=path, max_size=10)
+        store.add_event(make_event('id-1'))
+        store.add_event(make_event('id-2'))
+        store.close()
+
+        reloaded = EventStore(persist_file=path, max_size=10)
+        events = reloaded.get_events()
+        assert len(events) == 2
+        assert events[0]['delivery_id'] == 'id-2'
+
+    def test_persistence_is_append_only(self, store):
+        """Test that each add appends one JSON line"""
+        store.add_event(make_event('id-1'))
+        store.add_event(make_event('id-2'))
+        store.flush()
+
+        with open(store.persist_file) as f:
+            lines = [line for line in f if line.strip()]
+
+        assert len(lines) == 2
+        assert json.loads(lines[0])['delivery_id'] == 'id-1'
+
+    def test_filter_by_event_type(self, store):
+        """Test event type filtering"""
+        store.add_event(make_event('id-1', event_type='push'))
+        store.add_event(make_event('id-2', event_type='issues'))
+        store.add_event(make_event('id-3', event_type='push'))
+
+        events = store.get_events(event_type='push')
+        assert len(events) == 2
+        assert all(e['event_type'] == 'push' for e in events)
+
+    def test_filter_by_repository(self, store):
+        """Test repository substring filtering"""
+        store.add_event(make_event('id-1', repo_full_name='test-org/alpha'))
+        store.add_event(make_event('id-2', repo_full_name='test-org/beta'))
+
+        events = store.get_events(repository='alpha')
+        assert len(events) == 1
+        assert events[0]['delivery_id'] == 'id-1'
+
+    def test_filter_by_repository_name_only(self, store):
+        """Test filtering an event whose repository has no full_name"""
+        event = make_event('id-1')
+        event['repository'] = {'name': 'oddball'}
+        store.add_event(event)
+        store.add_event(make_event('id-2', repo_full_name='test-org/beta'))
+
+        events = store.get_events(repository='oddball')
+        assert len(events) == 1
+        assert events[0]['delivery_id'] == 'id-1'
+
+    def test_filter_by_since(self, store):
+        """Test timestamp filtering"""
+        store.add_event(make_event('id-1', timestamp='2025-01-01T00:00:00+00:00'))
+        store.add_event(make_event('id-2', timestamp='2025-06-01T00:00:00+00:00'))
+
+        events = store.get_events(since_ts=parse_timestamp('2025-03-01T00:00:00+00:00'))
+        assert len(events) == 1
+        assert events[0]['delivery_id'] == 'id-2'
+
+    def test_add_event_async(self, store):
+        """Test the async add path"""
+        asyncio.run(store.add_event_async(make_event('id-async')))
+
+        assert store.get_event_by_id('id-async') is not None
+
+    def test_get_event_by_id(self, store):
+        """Test delivery ID lookup"""
+        store.add_event(make_event('id-1'))
+        store.add_event(make_event('id-2'))
+
+        event = store.get_event_by_id('id-1')
+        assert event is not None
+        assert event['delivery_id'] == 'id-1'
+
+        assert store.get_event_by_id('missing') is None
+
+    def test_get_stats(self, store):
+        """Test summary statistics"""
+        store.add_event(make_event('id-1', event_type='push', repo_full_name='test-org/alpha'))
+        store.add_event(make_event('id-2', event_type='push', repo_full_name='test-org/beta'))
+        store.add_event(make_event('id-3', event_type='issues', repo_full_name='test-org/alpha'))
+
+        stats = store.get_stats()
+        assert stats['total_events'] == 3
+        assert stats['events_by_type'] == {'push': 2, 'issues': 1}
+        assert stats['repositories'] == ['test-org/alpha', 'test-org/beta']
+
+    def test_compact_skips_queued_but_unflushed_events(self, store):
+        """Test that compaction does not persist a queued event twice"""
+        store.add_event(make_event('id-1'))
+        store.flush()
+
+        # Stop the flusher so the queue state is deterministic, then stage
+        # an event exactly as add_event does: recorded and queued, but not
+        # yet flushed when compaction snapshots the store.
+        store._write_q.put(event_store._SHUTDOWN)
+        store._flush_thread.join()
+
+        with store._lock:
+            store._record_event(make_event('id-dup'))
+            store._write_q.put(make_event('id-dup'))
+
+        store.compact()
+
+        assert store._write_q.empty()
+        with open(store.persist_file) as f:
+            ids = [json.loads(line)['delivery_id'] for line in f if line.strip()]
+        assert ids.count('id-dup') == 1
+        assert ids.count('id-1') == 1
+
+    def test_flusher_restarts_after_fork(self, store):
+        """Test that the flusher is restarted when the process ID changes"""
+        store.add_event(make_event('id-parent'))
+        store.flush()
+
+        # Simulate a fork by pretending the flusher belongs to another
+        # process; the next add must spin up a live per-process flusher.
+        old_thread = store._flush_thread
+        store._pid = store._pid - 1
+
+        store.add_event(make_event('id-child'))
+        store.flush()
+
+        assert store._flush_thread is not old_thread
+        assert store._flush_thread.is_alive()
+
+        with open(store.persist_file) as f:
+            lines = [json.loads(line) for line in f if line.strip()]
+        assert any(e['delivery_id'] == 'id-child' for e in lines)
+
+    def test_concurrent_adds_keep_indices_consistent(self, store):
+        """Test that concurrent adds do not leak evicted events into indices"""
+        old_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            def add_many(worker: int) -> None:
+                for i in range(200):
+                    store.add_event(make_event(f'id-{worker}-{i}'))
+
+            threads = [threading.Thread(target=add_many, args=(w,)) for w in range(8)]
+            for t in threads:
+                t.start()
+            for t in threads:
+                t.join()
+        finally:
+            sys.setswitchinterval(old_interval)
+
+        assert len(store.events) == store.max_size
+        assert len(store._by_id) == store.max_size
+        assert sum(len(dq) for dq in store._by_type.values()) == store.max_size
+        assert sum(len(dq) for dq in store._by_repo.values()) == store.max_size
+        assert len(store.get_events(limit=10000)) == store.max_size
+        assert store.get_stats()['total_events'] == store.max_size
+
+    def test_compact_bounds_file_size(self, store):
+        """Test that compaction rewrites the file from retained events"""
+        for i in range(25):
+            store.add_event(make_event(f'id-{i}'))
+        store.flush()
+
+        with open(store.persist_file) as f:
+            lines = [line for line in f if line.strip()]
+
+        # Two compactions happened (at 10 and 20 adds); the file holds the
+        # 10 retained events plus the appends since the last compaction.
+        assert len(lines) <= store.max_size + store._adds_since_compact
+        assert len(store.get_events(limit=100)) == 10
+
+
+if __name__ == '__main__':
+    pytest.main([__file__, '-v', '--tb=short'])
@@ -10,6 +10,7 @@ import os
 import json
 import hmac
 import hashlib
+import tempfile
 import pytest
 from unittest.mock import patch, MagicMock
 from datetime import datetime
@@ -18,8 +19,10 @@ from datetime import datetime
 os.environ['WEBHOOK_SECRET'] = 'test_secret_123'
 os.environ['FLASK_SECRET_KEY'] = 'test-flask-secret'
 os.environ['DEBUG'] = 'True'
+os.environ['EVENT_STORE_FILE'] = os.path.join(tempfile.gettempdir(), 'code-buddy-test-events.jsonl')
 
 from webhook_processor import app, WebhookProcessor, WEBHOOK_SECRET
+from webhook_processor import processor as app_processor
 
 
 @pytest.fixture
@@ -55,9 +58,9 @@ def sample_payload():
         },
         "repository": {
             "id": 111222333,
-            "name": "test-repo",
-            "full_name": "test/test-repo",
-            "html_url": "https://github.com/test/test-repo",
+            "name": "demo-repo",
+            "full_name": "test-org/demo-repo",
+            "html_url": "https://github.com/test-org/demo-repo",
             "private": False,
             "default_branch": "main"
         },
@@ -152,37 +155,25 @@ class TestWebhookProcessor:
     
     def test_parse_issue_event(self, processor, sample_payload):
         """Test issue event parsing"""
-        with patch('webhook_processor.request') as mock_request:
-            mock_request.headers.get.side_effect = lambda key: {
-                'X-GitHub-Event': 'issues',
-                'X-GitHub-Delivery': 'test-delivery-id'
-            }.get(key)
-            
-            event = processor.parse_event(sample_payload)
-            
-            assert event['event_type'] == 'issues'
-            assert event['action'] == 'opened'
-            assert event['delivery_id'] == 'test-delivery-id'
-            assert event['issue']['title'] == 'Test Issue'
-            assert event['repository']['name'] == 'test-repo'
-            assert event['sender']['login'] == 'testuser'
-    
+        event = processor.parse_event(sample_payload, 'issues', 'test-delivery-id')
+
+        assert event['event_type'] == 'issues'
+        assert event['action'] == 'opened'
+        assert event['delivery_id'] == 'test-delivery-id'
+        assert event['title'] == 'Test Issue'
+        assert event['repository']['name'] == 'demo-repo'
+        assert event['sender']['login'] == 'testuser'
+
     def test_parse_push_event(self, processor, sample_push_payload):
         """Test push event parsing"""
-        with patch('webhook_processor.request') as mock_request:
-            mock_request.headers.get.side_effect = lambda key: {
-                'X-GitHub-Event': 'push',
-                'X-GitHub-Delivery': 'test-delivery-id'
-            }.get(key)
-            
-            event = processor.parse_event(sample_push_payload)
-            
-            assert event['event_type'] == 'push'
-            assert event['ref'] == 'refs/heads/main'
-            assert event['before'] == 'abc123'
-            assert event['after'] == 'def456'
-            assert len(event['commits']) == 1
-            assert event['commits'][0]['message'] == 'Test commit'
+        event = processor.parse_event(sample_push_payload, 'push', 'test-delivery-id')
+
+        assert event['event_type'] == 'push'
+        assert event['ref'] == 'refs/heads/main'
+        assert event['before'] == 'abc123'
+        assert event['after'] == 'def456'
+        assert len(event['commits']) == 1
+        assert event['commits'][0]['message'] == 'Test commit'
     
     def test_should_process_event(self, processor):
         """Test event filtering logic"""
@@ -239,13 +230,53 @@ class TestWebhookEndpoints:
                 'Content-Type': 'application/json',
                 'X-Hub-Signature-256': signature,
                 'X-GitHub-Event': 'issues',
-                'X-GitHub-Delivery': 'test-delivery'
+                'X-GitHub-Delivery': 'test-delivery-valid'
             }
         )
-        
+
         assert response.status_code == 200
         data = json.loads(response.data)
         assert data['status'] == 'processed'
+
+    def test_webhook_duplicate_delivery(self, client, sample_payload):
+        """Test that redeliveries with the same delivery ID are skipped"""
+        payload_body = json.dumps(sample_payload).encode()
+        signature = create_signature(payload_body, WEBHOOK_SECRET)
+        headers = {
+            'Content-Type': 'application/json',
+            'X-Hub-Signature-256': signature,
+            'X-GitHub-Event': 'issues',
+            'X-GitHub-Delivery': 'test-delivery-duplicate'
+        }
+
+        first = client.post('/webhook', data=payload_body, headers=headers)
+        assert first.status_code == 200
+        assert json.loads(first.data)['status'] == 'processed'
+
+        second = client.post('/webhook', data=payload_body, headers=headers)
+        assert second.status_code == 200
+        assert json.loads(second.data)['status'] == 'duplicate'
+
+    def test_webhook_failed_delivery_not_deduped(self, client, sample_payload):
+        """Test that a delivery that failed with a 500 can be redelivered"""
+        payload_body = json.dumps(sample_payload).encode()
+        signature = create_signature(payload_body, WEBHOOK_SECRET)
+        headers = {
+            'Content-Type': 'application/json',
+            'X-Hub-Signature-256': signature,
+            'X-GitHub-Event': 'issues',
+            'X-GitHub-Delivery': 'test-delivery-retry'
+        }
+
+        with patch.object(app_processor, 'process_event', side_effect=RuntimeError('boom')):
+            first = client.post('/webhook', data=payload_body, headers=headers)
+        assert first.status_code == 500
+
+        # GitHub redelivers the same delivery ID; the failed attempt must
+        # not have marked it as seen
+        second = client.post('/webhook', data=payload_body, headers=headers)
+        assert second.status_code == 200
+        assert json.loads(second.data)['status'] == 'processed'
     
     def test_webhook_invalid_signature(self, client, sample_payload):
         """Test webhook endpoint with invalid signature"""
@@ -310,10 +341,10 @@ class TestWebhookEndpoints:
                 'Content-Type': 'application/json',
                 'X-Hub-Signature-256': signature,
                 'X-GitHub-Event': 'issues',
-                'X-GitHub-Delivery': 'test-delivery'
+                'X-GitHub-Delivery': 'test-delivery-skipped'
             }
         )
-        
+
         assert response.status_code == 200
         data = json.loads(response.data)
         assert data['status'] == 'skipped'
@@ -376,20 +407,14 @@ class TestEventParsing:
             }
         }
         
-        with patch('webhook_processor.request') as mock_request:
-            mock_request.headers.get.side_effect = lambda key: {
-                'X-GitHub-Event': 'pull_request',
-                'X-GitHub-Delivery': 'test-delivery-id'
-            }.get(key)
-            
-            event = processor.parse_event(pr_payload)
-            
-            assert event['event_type'] == 'pull_request'
-            assert event['action'] == 'opened'
-            assert event['pr']['title'] == 'Test PR'
-            assert event['pr']['number'] == 42
-            assert event['pr']['head']['ref'] == 'feature-branch'
-            assert event['pr']['base']['ref'] == 'main'
+        event = processor.parse_event(pr_payload, 'pull_request', 'test-delivery-id')
+
+        assert event['event_type'] == 'pull_request'
+        assert event['action'] == 'opened'
+        assert event['title'] == 'Test PR'
+        assert event['number'] == 42
+        assert event['head']['ref'] == 'feature-branch'
+        assert event['base']['ref'] == 'main'
     
     def test_release_event_parsing(self, processor):
         """Test release event parsing"""
@@ -415,19 +440,13 @@ class TestEventParsing:
             }
         }
         
-        with patch('webhook_processor.request') as mock_request:
-            mock_request.headers.get.side_effect = lambda key: {
-                'X-GitHub-Event': 'release',
-                'X-GitHub-Delivery': 'test-delivery-id'
-            }.get(key)
-            
-            event = processor.parse_event(release_payload)
-            
-            assert event['event_type'] == 'release'
-            assert event['action'] == 'published'
-            assert event['release']['tag_name'] == 'v1.0.0'
-            assert event['release']['name'] == 'Release v1.0.0'
-            assert event['release']['draft'] is False
+        event = processor.parse_event(release_payload, 'release', 'test-delivery-id')
+
+        assert event['event_type'] == 'release'
+        assert event['action'] == 'published'
+        assert event['tag_name'] == 'v1.0.0'
+        assert event['name'] == 'Release v1.0.0'
+        assert event['draft'] is False
 
 
 if __name__ == '__main__':
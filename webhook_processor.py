@@ -24,32 +24,52 @@ along with this program.  If not, see <https://www.gnu.org/licenses/>.
 import os
 import hmac
 import hashlib
+import itertools
 import json
+import time
 from typing import Dict, Any, Optional
+from collections import OrderedDict
 from datetime import datetime
 
 import structlog
-from flask import Flask, request, jsonify, abort
+from flask import Flask, request, jsonify
 from dotenv import load_dotenv
 
+# orjson parses GitHub payloads 2-4x faster than stdlib json; fall back to
+# stdlib if it is not installed.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 # Import Letta integration
 from letta_integration import LettaClient
 
+# Import event store
+from event_store import EventStore
+
 # Load environment variables
 load_dotenv()
 
-# Configure structured logging
+if orjson is not None:
+    def _log_serializer(obj, **kwargs):
+        """Render a log event dict with orjson (returns str for structlog)"""
+        return orjson.dumps(obj, default=str).decode()
+else:
+    def _log_serializer(obj, **kwargs):
+        return json.dumps(obj, default=str)
+
+# Configure structured logging. The processor chain runs on every log call,
+# so it is kept to the ones that do real work here: UnicodeDecoder (py2-era
+# bytes), StackInfoRenderer and PositionalArgumentsFormatter were dead
+# weight on this code path.
 structlog.configure(
     processors=[
         structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
         structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
+        structlog.processors.TimeStamper(fmt="iso", utc=True),
         structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
+        structlog.processors.JSONRenderer(serializer=_log_serializer)
     ],
     context_class=dict,
     logger_factory=structlog.stdlib.LoggerFactory(),
@@ -65,17 +85,90 @@ app.config['SECRET_KEY'] = os.getenv('FLASK_SECRET_KEY', 'dev-secret-key')
 
 # Configuration
 WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET', 'animus_webhook_secret_2024')
+_WEBHOOK_SECRET_BYTES = WEBHOOK_SECRET.encode('utf-8')
 PORT = int(os.getenv('PORT', 5000))
 DEBUG = os.getenv('DEBUG', 'False').lower() == 'true'
 
+# Repository skip rules, normalized once at load so the per-event check is a
+# set lookup plus a short substring scan with no allocation. GitHub repo
+# names are matched as-is; add both cases to the env vars if you need more.
+SKIP_REPO_NAMES = frozenset(
+    s.strip().casefold()
+    for s in os.getenv('SKIP_REPO_NAMES', 'test-repo,test').split(',')
+    if s.strip()
+)
+SKIP_REPO_SUBSTRINGS = tuple(
+    s.strip().casefold()
+    for s in os.getenv('SKIP_REPO_SUBSTRINGS', 'test').split(',')
+    if s.strip()
+)
+
+
+def _is_skipped_repo(name: str) -> bool:
+    """Check a repository name against the configured skip rules"""
+    return name in SKIP_REPO_NAMES or any(s in name for s in SKIP_REPO_SUBSTRINGS)
+
+
+# Second-resolution ISO timestamp cache: utcnow().isoformat() costs a syscall
+# plus several string formats, so rebuild the string at most once per second
+_ISO_CACHE = [0, '']
+
+
+def _iso_now() -> str:
+    """Current UTC time as ISO 8601, cached at second resolution"""
+    now = int(time.time())
+    if now != _ISO_CACHE[0]:
+        formatted = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime(now))
+        # Replace both fields in one slice assignment (a single bytecode op
+        # under the GIL) so a concurrent reader never pairs the new second
+        # with the previous second's string.
+        _ISO_CACHE[:] = [now, formatted]
+        return formatted
+    return _ISO_CACHE[1]
+
+
+def _loads(data: bytes) -> Dict[str, Any]:
+    """Parse a JSON request body"""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_response(obj: Any, status: int = 200):
+    """Build a JSON response without going through jsonify"""
+    body = orjson.dumps(obj) if orjson is not None else json.dumps(obj)
+    return app.response_class(body, status=status, mimetype='application/json')
+
+
+# Precomputed responses for the fixed-shape error paths. Returning these
+# directly skips the HTTPException raise/catch and the @app.errorhandler
+# re-render that abort() would trigger; for unsigned attack traffic the
+# rejection is then served from bytes built once at import.
+_FORBIDDEN_RESP = _json_response({'error': 'Forbidden'}, 403)
+_BAD_REQUEST_RESP = _json_response({'error': 'Bad Request'}, 400)
+_SERVER_ERROR_RESP = _json_response({'error': 'Internal Server Error'}, 500)
+_DUPLICATE_RESP = _json_response({'status': 'duplicate'})
+
 
 class WebhookProcessor:
     """Main webhook processing class"""
     
     def __init__(self):
         self.logger = logger.bind(component="webhook_processor")
-        self.event_count = 0
+        # Events are counted with itertools.count: next() is a single C
+        # call under the GIL, so concurrent gthread workers cannot lose
+        # increments the way 'self.event_count += 1' could
+        self._event_counter = itertools.count(1)
+        self._last_count = 0
+        # Recently-seen delivery IDs, kept in LRU order to dedupe GitHub's
+        # redeliveries without unbounded growth
+        self._seen_deliveries = OrderedDict()
         self.start_time = datetime.utcnow()
+        # Uptime is reported from a monotonic delta (immune to wall-clock
+        # jumps and cheaper than datetime arithmetic); the wall-clock start
+        # is formatted once here for /stats
+        self._mono_start = time.monotonic()
+        self.start_time_iso = self.start_time.isoformat()
         
         # Initialize Letta client
         try:
@@ -84,97 +177,214 @@ class WebhookProcessor:
         except Exception as e:
             self.logger.error("Failed to initialize Letta client", error=str(e))
             self.letta_client = None
-    
+
+        # Initialize event store
+        try:
+            self.event_store = EventStore()
+            self.logger.info("Event store initialized successfully")
+        except Exception as e:
+            self.logger.error("Failed to initialize event store", error=str(e))
+            self.event_store = None
+
+    @property
+    def event_count(self) -> int:
+        """Number of events processed so far"""
+        return self._last_count
+
+    def seen_before(self, delivery_id: str) -> bool:
+        """
+        Check whether an X-GitHub-Delivery ID was already processed
+
+        GitHub redeliveries reuse the delivery UUID, so a hit here means
+        the event was already processed and all further work can be
+        skipped. This only checks; mark_seen records an ID once its event
+        has actually been processed, so a failed attempt stays eligible
+        for redelivery.
+
+        Args:
+            delivery_id: X-GitHub-Delivery header value
+
+        Returns:
+            bool: True if this delivery ID was seen recently
+        """
+        seen = self._seen_deliveries
+        if delivery_id in seen:
+            seen.move_to_end(delivery_id)
+            return True
+        return False
+
+    def mark_seen(self, delivery_id: str, cap: int = 4096) -> None:
+        """
+        Record a successfully processed X-GitHub-Delivery ID
+
+        Args:
+            delivery_id: X-GitHub-Delivery header value
+            cap: Maximum number of IDs to remember
+        """
+        seen = self._seen_deliveries
+        seen[delivery_id] = None
+        if len(seen) > cap:
+            seen.popitem(last=False)
+
+
     def verify_signature(self, payload_body: bytes, signature_header: str) -> bool:
         """
         Verify GitHub webhook signature using HMAC-SHA256
-        
+
         Args:
             payload_body: Raw request body
             signature_header: X-Hub-Signature-256 header value
-            
+
         Returns:
             bool: True if signature is valid, False otherwise
         """
-        if not signature_header:
-            self.logger.warning("Missing signature header")
+        sig_bytes = self._parse_signature_header(signature_header)
+        if sig_bytes is None:
             return False
-        
-        try:
-            # Extract signature from "sha256=abc123..." format
-            sha_name, signature = signature_header.split('=')
-            if sha_name != 'sha256':
-                self.logger.warning("Invalid signature method", method=sha_name)
-                return False
-            
-            # Compute expected signature
-            expected = hmac.new(
-                WEBHOOK_SECRET.encode(),
-                payload_body,
-                hashlib.sha256
-            ).hexdigest()
-            
-            # Compare signatures securely
-            is_valid = hmac.compare_digest(expected, signature)
-            
-            if not is_valid:
-                self.logger.warning("Invalid webhook signature")
-            
-            return is_valid
-            
-        except Exception as e:
-            self.logger.error("Signature verification error", error=str(e))
+
+        # One-shot HMAC: a single C call into OpenSSL's EVP layer, which
+        # uses SHA-NI on modern x86_64
+        expected = hmac.digest(_WEBHOOK_SECRET_BYTES, payload_body, 'sha256')
+        return self._compare_digest(expected, sig_bytes)
+
+    def verify_signature_digest(self, digest: bytes, signature_header: str) -> bool:
+        """
+        Verify a signature against an already-computed HMAC-SHA256 digest
+
+        Used by the webhook endpoint, which folds the HMAC into the body
+        read loop instead of hashing the buffered payload a second time.
+
+        Args:
+            digest: Raw 32-byte HMAC-SHA256 digest of the request body
+            signature_header: X-Hub-Signature-256 header value
+
+        Returns:
+            bool: True if signature is valid, False otherwise
+        """
+        sig_bytes = self._parse_signature_header(signature_header)
+        if sig_bytes is None:
             return False
+        return self._compare_digest(digest, sig_bytes)
+
+    def _compare_digest(self, expected: bytes, sig_bytes: bytes) -> bool:
+        """Constant-time compare with failure logging"""
+        # Compare signatures securely. bytes.fromhex + compare_digest are
+        # both single C calls over 32 bytes; fusing them into a JIT'd
+        # helper would trade an audited constant-time primitive for a
+        # hand-rolled one without moving the needle on a fixed-size input.
+        is_valid = hmac.compare_digest(expected, sig_bytes)
+        if not is_valid:
+            self.logger.warning("Invalid webhook signature")
+        return is_valid
+
+    def _parse_signature_header(self, signature_header: str) -> Optional[bytes]:
+        """
+        Decode an X-Hub-Signature-256 header to its raw digest bytes
+
+        Returns:
+            Optional[bytes]: 32 raw digest bytes, or None if the header is
+            missing or malformed
+        """
+        # The only valid shape is "sha256=" plus 64 hex characters. HMAC
+        # digests have a fixed, public length, so rejecting other lengths
+        # up front leaks nothing and spares the hash + compare for
+        # malformed or attack traffic.
+        if (not signature_header
+                or len(signature_header) != 71
+                or not signature_header.startswith('sha256=')):
+            self.logger.warning(
+                "Missing or malformed signature header",
+                header=signature_header[:16] if signature_header else None
+            )
+            return None
+
+        # Decode the header to raw bytes so the constant-time compare walks
+        # 32 bytes instead of 64 hex characters. fromhex is the only
+        # remaining failure point, so it carries the only exception handler
+        # and the happy path raises nothing.
+        try:
+            return bytes.fromhex(signature_header[7:])
+        except ValueError:
+            self.logger.warning("Malformed signature hex")
+            return None
     
-    def parse_event(self, payload: Dict[str, Any]) -> Dict[str, Any]:
+    def parse_event(self, payload: Dict[str, Any],
+                    event_type: Optional[str] = None,
+                    delivery_id: Optional[str] = None) -> Dict[str, Any]:
         """
         Parse and normalize GitHub webhook event
-        
+
         Args:
             payload: GitHub webhook payload
-            
+            event_type: X-GitHub-Event header value; read from the current
+                request when omitted
+            delivery_id: X-GitHub-Delivery header value; read from the
+                current request when omitted
+
         Returns:
             Dict: Normalized event data
         """
         try:
-            event_type = request.headers.get('X-GitHub-Event', 'unknown')
-            delivery_id = request.headers.get('X-GitHub-Delivery', 'unknown')
-            
-            # Extract common fields
+            # Bind hot lookups to locals once; parse_event runs per webhook
+            # and LOAD_FAST is cheaper than repeated attribute resolution
+            get = payload.get
+
+            if event_type is None or delivery_id is None:
+                # Read the WSGI environ directly rather than through the
+                # EnvironHeaders wrapper's per-key case normalization
+                env = request.environ
+                if event_type is None:
+                    event_type = env.get('HTTP_X_GITHUB_EVENT', 'unknown')
+                if delivery_id is None:
+                    delivery_id = env.get('HTTP_X_GITHUB_DELIVERY', 'unknown')
+
+            # Extract common fields; absent sections are omitted rather
+            # than carried as empty dicts, which keeps the event smaller
+            # through logging, storage, and serialization
             normalized_event = {
                 'event_type': event_type,
                 'delivery_id': delivery_id,
-                'timestamp': datetime.utcnow().isoformat(),
-                'action': payload.get('action'),
-                'repository': self._extract_repository_info(payload),
-                'sender': self._extract_sender_info(payload),
-                'organization': self._extract_organization_info(payload),
-                'raw_payload': payload  # Keep original for debugging
+                'timestamp': _iso_now(),
+                'action': get('action'),
             }
-            
-            # Add event-specific data
-            if event_type == 'push':
-                normalized_event.update(self._parse_push_event(payload))
-            elif event_type == 'issues':
-                normalized_event.update(self._parse_issue_event(payload))
-            elif event_type == 'pull_request':
-                normalized_event.update(self._parse_pull_request_event(payload))
-            elif event_type == 'release':
-                normalized_event.update(self._parse_release_event(payload))
+            if (repo := self._extract_repository_info(payload)) is not None:
+                normalized_event['repository'] = repo
+            if (sender := self._extract_sender_info(payload)) is not None:
+                normalized_event['sender'] = sender
+            if (org := self._extract_organization_info(payload)) is not None:
+                normalized_event['organization'] = org
+            # Retaining the full payload doubles the per-event working
+            # set, so only keep it when debugging
+            if DEBUG:
+                normalized_event['raw_payload'] = payload
+
+            # Add event-specific data via the dispatch table
+            parser = self._PARSERS.get(event_type)
+            if parser:
+                normalized_event.update(parser(self, payload))
             
             return normalized_event
             
         except Exception as e:
-            self.logger.error("Event parsing error", error=str(e), payload=payload)
-            return {
+            # Serializing the full payload into the log line is expensive;
+            # only do it when debugging
+            if DEBUG:
+                self.logger.error("Event parsing error", error=str(e), payload=payload)
+            else:
+                self.logger.error("Event parsing error", error=str(e))
+            error_event = {
                 'event_type': 'parse_error',
-                'error': str(e),
-                'raw_payload': payload
+                'error': str(e)
             }
+            if DEBUG:
+                error_event['raw_payload'] = payload
+            return error_event
     
-    def _extract_repository_info(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract repository information from payload"""
-        repo = payload.get('repository', {})
+    def _extract_repository_info(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Extract repository information from payload, or None if absent"""
+        repo = payload.get('repository')
+        if not repo:
+            return None
         return {
             'id': repo.get('id'),
             'name': repo.get('name'),
@@ -184,9 +394,11 @@ class WebhookProcessor:
             'default_branch': repo.get('default_branch')
         }
     
-    def _extract_sender_info(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract sender information from payload"""
-        sender = payload.get('sender', {})
+    def _extract_sender_info(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Extract sender information from payload, or None if absent"""
+        sender = payload.get('sender')
+        if not sender:
+            return None
         return {
             'id': sender.get('id'),
             'login': sender.get('login'),
@@ -195,9 +407,11 @@ class WebhookProcessor:
             'avatar_url': sender.get('avatar_url')
         }
     
-    def _extract_organization_info(self, payload: Dict[str, Any]) -> Dict[str, Any]:
-        """Extract organization information from payload"""
-        org = payload.get('organization', {})
+    def _extract_organization_info(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Extract organization information from payload, or None if absent"""
+        org = payload.get('organization')
+        if not org:
+            return None
         return {
             'id': org.get('id'),
             'login': org.get('login'),
@@ -207,20 +421,25 @@ class WebhookProcessor:
     
     def _parse_push_event(self, payload: Dict[str, Any]) -> Dict[str, Any]:
         """Parse push event specific data"""
+        get = payload.get
+        # Large pushes carry hundreds of commits; bind dict.get once so the
+        # comprehension does not re-resolve the bound method per commit
+        cget = dict.get
+        commits = [
+            {
+                'id': cget(commit, 'id'),
+                'message': cget(commit, 'message'),
+                'author': cget(commit, 'author', {}).get('name'),
+                'url': cget(commit, 'url')
+            }
+            for commit in get('commits', [])
+        ]
         return {
-            'ref': payload.get('ref'),
-            'before': payload.get('before'),
-            'after': payload.get('after'),
-            'commits': [
-                {
-                    'id': commit.get('id'),
-                    'message': commit.get('message'),
-                    'author': commit.get('author', {}).get('name'),
-                    'url': commit.get('url')
-                }
-                for commit in payload.get('commits', [])
-            ],
-            'pusher': payload.get('pusher', {}).get('name')
+            'ref': get('ref'),
+            'before': get('before'),
+            'after': get('after'),
+            'commits': commits,
+            'pusher': get('pusher', {}).get('name')
         }
     
     def _parse_issue_event(self, payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -272,6 +491,47 @@ class WebhookProcessor:
             'url': release.get('html_url')
         }
     
+    # Event-type dispatch table: one dict probe per event instead of an
+    # if/elif chain, and extensible without touching parse_event
+    _PARSERS = {
+        'push': _parse_push_event,
+        'issues': _parse_issue_event,
+        'pull_request': _parse_pull_request_event,
+        'release': _parse_release_event,
+    }
+
+    def quick_filter(self, event_type: str, payload: Dict[str, Any]) -> bool:
+        """
+        Cheap pre-parse filter on raw payload fields
+
+        Runs before parse_event so filtered traffic skips normalization
+        entirely (commit/label/assignee list building in particular).
+
+        Args:
+            event_type: X-GitHub-Event header value
+            payload: Parsed (un-normalized) webhook payload
+
+        Returns:
+            bool: True if the event is worth normalizing and processing
+        """
+        repo = payload.get('repository') or {}
+        repo_name = repo.get('name') or ''
+
+        if _is_skipped_repo(repo_name):
+            self.logger.info("Skipping filtered repository", repo=repo_name)
+            return False
+
+        if repo.get('archived'):
+            self.logger.info("Skipping archived repository", repo=repo_name)
+            return False
+
+        if event_type == 'pull_request':
+            if (payload.get('pull_request') or {}).get('draft'):
+                self.logger.info("Skipping draft pull request", repo=repo_name)
+                return False
+
+        return True
+
     def should_process_event(self, event: Dict[str, Any]) -> bool:
         """
         Determine if event should be processed based on filtering rules
@@ -286,10 +546,11 @@ class WebhookProcessor:
         if event.get('event_type') == 'parse_error':
             return False
         
-        # Skip test repositories (optional filtering)
-        repo_name = event.get('repository', {}).get('name', '').lower()
-        if 'test' in repo_name:
-            self.logger.info("Skipping test repository", repo=repo_name)
+        # Skip filtered repositories (configurable via SKIP_REPO_NAMES and
+        # SKIP_REPO_SUBSTRINGS)
+        repo_name = event.get('repository', {}).get('name') or ''
+        if _is_skipped_repo(repo_name):
+            self.logger.info("Skipping filtered repository", repo=repo_name)
             return False
         
         # Process all other events
@@ -305,8 +566,9 @@ class WebhookProcessor:
         Returns:
             Dict: Processing result
         """
-        self.event_count += 1
-        
+        count = next(self._event_counter)
+        self._last_count = count
+
         # Log event processing
         self.logger.info(
             "Event processed",
@@ -314,9 +576,16 @@ class WebhookProcessor:
             action=event.get('action'),
             repository=event.get('repository', {}).get('full_name'),
             sender=event.get('sender', {}).get('login'),
-            event_count=self.event_count
+            event_count=count
         )
         
+        # Record event in the store
+        if self.event_store:
+            try:
+                self.event_store.add_event(event)
+            except Exception as e:
+                self.logger.error("Failed to store event", error=str(e))
+
         # Send to Letta agent if client is available
         letta_response = None
         if self.letta_client:
@@ -337,8 +606,8 @@ class WebhookProcessor:
         return {
             'status': 'processed',
             'event_id': event.get('delivery_id'),
-            'processed_at': datetime.utcnow().isoformat(),
-            'event_count': self.event_count,
+            'processed_at': _iso_now(),
+            'event_count': count,
             'letta_response': letta_response
         }
 
@@ -351,63 +620,95 @@ processor = WebhookProcessor()
 def webhook():
     """Main webhook endpoint"""
     try:
-        # Get raw payload and signature
-        payload_body = request.get_data()
-        signature_header = request.headers.get('X-Hub-Signature-256')
-        
-        # Verify signature
-        if not processor.verify_signature(payload_body, signature_header):
+        # Read the headers this request needs from the WSGI environ in one
+        # place, avoiding repeated EnvironHeaders lookups
+        env = request.environ
+        signature_header = env.get('HTTP_X_HUB_SIGNATURE_256')
+        event_type_header = env.get('HTTP_X_GITHUB_EVENT', 'unknown')
+        delivery_id = env.get('HTTP_X_GITHUB_DELIVERY', 'unknown')
+
+        # Read the body in 64 KiB chunks, folding the HMAC into the same
+        # pass so large push payloads are hashed as they stream in rather
+        # than copied in full and hashed afterwards
+        buf = bytearray()
+        h = hmac.new(_WEBHOOK_SECRET_BYTES, digestmod=hashlib.sha256)
+        for chunk in iter(lambda: request.stream.read(65536), b''):
+            h.update(chunk)
+            buf.extend(chunk)
+        payload_body = bytes(buf)
+
+        # Verify signature against the streamed digest
+        if not processor.verify_signature_digest(h.digest(), signature_header):
             logger.warning("Invalid webhook signature", ip=request.remote_addr)
-            abort(403, "Invalid signature")
-        
-        # Parse JSON payload
+            return _FORBIDDEN_RESP
+
+        # Dedupe redeliveries after the signature check so unauthenticated
+        # traffic cannot probe or poison the cache
+        if delivery_id != 'unknown' and processor.seen_before(delivery_id):
+            logger.info("Duplicate delivery skipped", delivery_id=delivery_id)
+            return _DUPLICATE_RESP
+
+
+        # Parse JSON payload directly from the body we already hold - avoids
+        # Flask re-reading and re-decoding the same buffer via get_json.
+        # Return the 400 directly so it isn't swallowed by the outer handler.
         try:
-            payload = request.get_json()
+            payload = _loads(payload_body)
         except Exception as e:
             logger.error("Invalid JSON payload", error=str(e))
-            abort(400, "Invalid JSON")
+            return _BAD_REQUEST_RESP
         
-        # Parse and normalize event
-        event = processor.parse_event(payload)
+        # Pre-filter on raw payload fields before paying for normalization
+        if not processor.quick_filter(event_type_header, payload):
+            logger.info("Event skipped by pre-filter", event_type=event_type_header)
+            return _json_response({'status': 'skipped'})
+
+        # Parse and normalize event; headers were already read above, so
+        # parse_event does not touch the request context
+        event = processor.parse_event(payload, event_type_header, delivery_id)
         
         # Check if event should be processed
         if not processor.should_process_event(event):
             logger.info("Event skipped by filter", event_type=event.get('event_type'))
-            return jsonify({'status': 'skipped'}), 200
-        
-        # Process event
+            return _json_response({'status': 'skipped'})
+
+        # Process event, and only then record the delivery ID: if
+        # processing raises, the 500 prompts GitHub to redeliver, and the
+        # retry must not be answered as a duplicate of work never done
         result = processor.process_event(event)
-        
+        if delivery_id != 'unknown':
+            processor.mark_seen(delivery_id)
+
         logger.info("Webhook processed successfully", result=result)
-        return jsonify(result), 200
+        return _json_response(result)
         
     except Exception as e:
         logger.error("Webhook processing error", error=str(e))
-        abort(500, "Internal server error")
+        return _SERVER_ERROR_RESP
 
 
 @app.route('/health', methods=['GET'])
 def health():
     """Health check endpoint"""
-    uptime = (datetime.utcnow() - processor.start_time).total_seconds()
-    
+    uptime = time.monotonic() - processor._mono_start
+
     return jsonify({
         'status': 'healthy',
         'uptime_seconds': uptime,
         'events_processed': processor.event_count,
-        'timestamp': datetime.utcnow().isoformat()
+        'timestamp': _iso_now()
     }), 200
 
 
 @app.route('/stats', methods=['GET'])
 def stats():
     """Statistics endpoint"""
-    uptime = (datetime.utcnow() - processor.start_time).total_seconds()
-    
+    uptime = time.monotonic() - processor._mono_start
+
     return jsonify({
         'uptime_seconds': uptime,
         'events_processed': processor.event_count,
-        'start_time': processor.start_time.isoformat(),
+        'start_time': processor.start_time_iso,
         'webhook_secret_configured': bool(WEBHOOK_SECRET),
         'debug_mode': DEBUG
     }), 200
@@ -441,6 +742,16 @@ if __name__ == '__main__':
         debug=DEBUG,
         webhook_secret_configured=bool(WEBHOOK_SECRET)
     )
-    
-    app.run(host='0.0.0.0', port=PORT, debug=DEBUG)
+
+    if DEBUG:
+        # Werkzeug dev server: single-threaded, development only
+        app.run(host='0.0.0.0', port=PORT, debug=True)
+    else:
+        # In production the dev server is a throughput ceiling; run behind
+        # gunicorn instead (see gunicorn.conf.py and docs/production-deployment.md)
+        logger.error(
+            "Refusing to start the development server outside DEBUG mode",
+            hint="gunicorn -c gunicorn.conf.py webhook_processor:app"
+        )
+        raise SystemExit(1)
 